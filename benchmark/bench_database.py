@@ -0,0 +1,275 @@
+'''
+Rain_DB Benchmarks On A Local SQLite File
+
+Usage:
+    python benchmark/bench_database.py <bench_name> [rows]
+'''
+import os, sys, time, tracemalloc, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+
+from func.database import Rain_DB
+
+
+def measure(func, *args, **kwargs) -> tuple:
+    '''
+    Run `func` once, return (result, seconds, peak traced MB)
+    '''
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed_time = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed_time, peak / 1024 ** 2
+
+
+def sample_db(rows: int, table_name: str = 'bench') -> tuple[Rain_DB, str]:
+    '''
+    Create a sqlite file with `rows` rows of mixed column types
+    '''
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    db = Rain_DB(f'sqlite:///{path}')
+    db.create_table(table_name, {
+        'user_id': 'int', 'score': 'float', 'city': 'varchar(32)',
+        'note': 'text', 'created': 'datetime',
+    })
+    rng = np.random.default_rng(5)
+    cities = np.array(['Beijing', 'Shanghai', 'Nanyang', 'Wuhan', 'Xian'])
+    chunk = 200000
+    for start in range(0, rows, chunk):
+        size = min(chunk, rows - start)
+        frame = pd.DataFrame({
+            'user_id': rng.integers(0, 1_000_000, size),
+            'score': rng.random(size).astype('float32'),
+            'city': cities[rng.integers(0, len(cities), size)],
+            'note': [f'note-{i}' for i in range(start, start + size)],
+            'created': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 86400 * 365, size), 's'),
+        })
+        frame.to_sql(table_name, db.engine, if_exists = 'append', index = False)
+    return db, table_name
+
+
+def bench_columnar_fetch(rows: int = 2_000_000):
+    '''
+    Tuple-list fetch (`exec` + `pd.DataFrame`) vs columnar `get_table`
+    '''
+    db, table_name = sample_db(rows)
+
+    def tuple_path():
+        data = db.exec(f'select * from {table_name}')
+        return pd.DataFrame(data[1:], columns = data[0])
+
+    for label, func in (('tuple list', tuple_path), ('columnar', lambda: db.get_table(table_name))):
+        frame, seconds, peak = measure(func)
+        size = frame.memory_usage(deep = True).sum() / 1024 ** 2
+        print(f'{label:>12}: {seconds:7.2f}s  peak {peak:8.1f} MB  frame {size:8.1f} MB')
+        print(' ' * 14 + ', '.join(f'{k}:{v}' for k, v in frame.dtypes.astype(str).items()))
+    db.close()
+
+
+def bench_bulk_insert(rows: int = 1_000_000):
+    '''
+    Default `DataFrame.to_sql` vs batched `Rain_DB.insert` for DataFrame and list-of-dicts
+    '''
+    db, _ = sample_db(0)
+    frame = pd.DataFrame({
+        'user_id': np.arange(rows), 'score': np.random.default_rng(5).random(rows),
+        'city': 'Nanyang', 'note': 'bulk',
+    })
+    records = frame.to_dict(orient = 'records')
+
+    for table_name in ('to_sql', 'frame', 'records'):
+        db.create_table(table_name, {'user_id': 'int', 'score': 'float', 'city': 'varchar(32)', 'note': 'text'})
+
+    start_time = time.perf_counter()
+    frame.to_sql('to_sql', db.engine, if_exists = 'append', index = False)
+    seconds = time.perf_counter() - start_time
+    print(f'{"to_sql":>8}: {rows} rows in {seconds:.2f}s ({rows / seconds:.0f} rows/s)')
+
+    for table_name, data in (('frame', frame), ('records', records)):
+        ok, info = db.insert(data, table_name, chunksize = 50000)
+        print(f'{table_name:>8}: {info}')
+    db.close()
+
+
+def bench_bulk_update(rows: int = 200_000):
+    '''
+    CASE statement vs staging table `Rain_DB.update` across batch sizes
+    '''
+    db, table_name = sample_db(rows)
+    print(f'{"batch":>8} {"case":>10} {"staged":>10}')
+    for batch in (100, 1000, 10000, 50000):
+        changes = pd.DataFrame({'id': np.arange(1, batch + 1), 'score': np.float32(0.5), 'city': 'Wuhan'})
+        timing = []
+        for threshold in (batch, 0):
+            # CASE compile/evaluation grows quadratically, skip where it takes minutes
+            if threshold and batch > 10000:
+                timing.append('-')
+                continue
+            start_time = time.perf_counter()
+            db.update(changes, 'id', table_name, chunksize = batch, case_threshold = threshold)
+            timing.append(f'{time.perf_counter() - start_time:.3f}s')
+        print(f'{batch:>8} {timing[0]:>10} {timing[1]:>10}')
+    db.close()
+
+
+def bench_schema_snapshot(tables: int = 300):
+    '''
+    Startup plus touching every table's columns, with and without schema snapshot
+    '''
+    folder = tempfile.mkdtemp()
+    url = f'sqlite:///{os.path.join(folder, "schema.db")}'
+    db = Rain_DB(url)
+    for index in range(tables):
+        db.exec(f'create table t_{index} (id integer primary key, name varchar(32), score float, '
+                f'city text, amount numeric(10, 2), created datetime, flag boolean, note text)')
+    db.close()
+
+    def startup(**kwargs):
+        db = Rain_DB(url, **kwargs)
+        for table_name in db.tables:
+            db.curr_table = table_name
+            db.column
+        db.close()
+
+    for label, kwargs in (
+        ('no snapshot', {}),
+        ('cold snapshot', {'schema_cache': folder}),
+        ('warm snapshot', {'schema_cache': folder}),
+    ):
+        start_time = time.perf_counter()
+        startup(**kwargs)
+        print(f'{label:>14}: {time.perf_counter() - start_time:.3f}s for {tables} tables')
+
+
+def bench_async_fanout(queries: int = 2000, concurrency: int = 16):
+    '''
+    Point queries fanned out by a thread pool over `Rain_DB` vs `AsyncRain_DB.gather`
+    '''
+    from func.async_database import AsyncRain_DB, dispose_async_engines
+
+    db, table_name = sample_db(100_000)
+    url = db.engine.url
+    sqls = [f'select * from {table_name} where id = {i * 37 % 100_000 + 1}' for i in range(queries)]
+    pool = {'pool_size': concurrency}
+
+    sync_db = Rain_DB(url, pool = pool)
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(sync_db.exec, sqls))
+    seconds = time.perf_counter() - start_time
+    print(f'{"threaded sync":>14}: {queries / seconds:8.0f} queries/s')
+
+    async def fanout():
+        async_db = AsyncRain_DB(url, pool = pool)
+        start_time = time.perf_counter()
+        await async_db.gather(sqls, limit = concurrency)
+        seconds = time.perf_counter() - start_time
+        await dispose_async_engines()
+        return seconds
+
+    seconds = asyncio.run(fanout())
+    print(f'{"async gather":>14}: {queries / seconds:8.0f} queries/s')
+    db.close()
+
+
+def bench_parallel_export(rows: int = 2_000_000):
+    '''
+    `get_table` wall time and slowest partition for growing `parallel`
+    '''
+    db, table_name = sample_db(rows)
+    for parallel in (1, 2, 4, 8):
+        for executor in ('thread', 'process'):
+            if parallel == 1 and executor == 'process':
+                continue
+            start_time = time.perf_counter()
+            db.get_table(table_name, parallel = parallel, executor = executor)
+            seconds = time.perf_counter() - start_time
+            slowest = max((i['seconds'] for i in db.partition_stats), default = seconds)
+            print(f'parallel {parallel} {executor:>7}: {seconds:6.2f}s  slowest partition {slowest:6.2f}s')
+    db.close()
+
+
+def bench_point_lookup(lookups: int = 20000):
+    '''
+    Repeated primary key lookups, f-string sql vs bind parameters through `exec`
+    '''
+    db, table_name = sample_db(100_000)
+    ids = [i * 37 % 100_000 + 1 for i in range(lookups)]
+
+    for label, run in (
+        ('f-string', lambda i: db.exec(f'select * from {table_name} where id = {i}')),
+        ('params', lambda i: db.exec(f'select * from {table_name} where id = :id', params = {'id': i})),
+    ):
+        start_time = time.perf_counter()
+        for i in ids:
+            run(i)
+        seconds = time.perf_counter() - start_time
+        print(f'{label:>9}: {lookups / seconds:8.0f} lookups/s  {seconds / lookups * 1e6:6.1f} us/lookup')
+    db.close()
+
+
+def bench_upsert(rows: int = 200_000):
+    '''
+    Batched `Rain_DB.upsert` of half existing, half new rows
+    '''
+    db, table_name = sample_db(rows)
+    changes = pd.DataFrame({
+        'id': np.arange(rows // 2 + 1, rows + rows // 2 + 1), 'user_id': 1, 'score': 0.5, 'city': 'Wuhan',
+    })
+    ok, info = db.upsert(changes, 'id', table_name, chunksize = 20000)
+    print(f'upsert: {info}')
+    db.close()
+
+
+def bench_sync_table(rows: int = 1_000_000, new_rows: int = 1000):
+    '''
+    Refresh after `new_rows` appended rows, full `dataframe` reload vs `sync_table`
+    '''
+    db, table_name = sample_db(rows)
+    db.curr_table = table_name
+    cache_path = os.path.join(tempfile.mkdtemp(), 'sync.pkl')
+    _, seconds, _ = measure(db.sync_table, table_name, cache_path = cache_path)
+    print(f'initial sync: {seconds:6.2f}s')
+
+    db.insert([{'user_id': i, 'score': 0.5, 'city': 'Wuhan'} for i in range(new_rows)], table_name)
+    frame, seconds, peak = measure(lambda: db.dataframe)
+    print(f' full reload: {seconds:6.2f}s  peak {peak:7.1f} MB  {len(frame)} rows')
+    frame, seconds, peak = measure(db.sync_table, table_name, cache_path = cache_path)
+    print(f'  incremental: {seconds:6.2f}s  peak {peak:7.1f} MB  {len(frame)} rows')
+    db.close()
+
+
+def bench_export_import(rows: int = 2_000_000):
+    '''
+    Streaming `export_table` / `import_table` throughput per file format,
+    peak memory is taken from a second traced run since tracing slows the row loops
+    '''
+    db, table_name = sample_db(rows)
+    folder = tempfile.mkdtemp()
+    for format in ('parquet', 'feather', 'csv'):
+        path = os.path.join(folder, f'{table_name}.{format}')
+        _, info = db.export_table(table_name, path, chunksize = 100000)
+        _, _, peak = measure(db.export_table, table_name, path, chunksize = 100000)
+        print(f'{format:>8} export: {info}  peak {peak:7.1f} MB  {os.path.getsize(path) / 1024 ** 2:7.1f} MB file')
+
+        _, seconds, peak = measure(Rain_DB.read_export, path)
+        print(f'{format:>8}   read: {rows / seconds:10.0f} rows/s  peak {peak:7.1f} MB')
+
+        _, info = db.import_table(path, f'{table_name}_{format}', chunksize = 100000)
+        _, _, peak = measure(db.import_table, path, f'{table_name}_{format}_traced', chunksize = 100000)
+        print(f'{format:>8} import: {info}  peak {peak:7.1f} MB')
+    db.close()
+
+
+if __name__ == '__main__':
+    bench_name = sys.argv[1] if len(sys.argv) > 1 else 'columnar_fetch'
+    bench_args = [int(i) for i in sys.argv[2:]]
+    globals()[f'bench_{bench_name}'](*bench_args)
@@ -0,0 +1,249 @@
+'''
+Rain_Dis Benchmarks On A Local redis-server
+
+Usage:
+    REDIS_HOST=localhost REDIS_PORT=6379 python benchmark/bench_redis.py <bench_name> [size]
+
+Benchmarks write into db 15 and flush it first.
+'''
+import os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from func.database import Rain_DB, Rain_Dis
+from func.codec import Codec
+
+
+def redis_cursor() -> Rain_Dis:
+    '''
+    Rain_Dis of the benchmark database, flushed
+    '''
+    cursor = Rain_Dis(os.environ.get('REDIS_HOST', 'localhost'), int(os.environ.get('REDIS_PORT', 6379)), db = 15)
+    cursor.cursor.flushdb()
+    return cursor
+
+
+def timed(func, *args, **kwargs) -> float:
+    start_time = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start_time
+
+
+def bench_pipelined_set(size: int = 10000):
+    '''
+    Writing a `size` element list / dict, one command per element vs one pipelined transaction
+    '''
+    cursor = redis_cursor()
+    values = [f'value-{i}' for i in range(size)]
+    fields = {f'field-{i}': i for i in range(size)}
+
+    def per_element():
+        for i in values:
+            cursor.cursor.lpush('list-old', i)
+        for k, v in fields.items():
+            cursor.cursor.hset('hash-old', k, v)
+
+    def pipelined():
+        cursor.set('list-new', values, 600)
+        cursor.set('hash-new', fields, 600)
+
+    for label, run in (('per element', per_element), ('pipelined', pipelined)):
+        print(f'{label:>12}: {timed(run):7.3f}s for a {size} element list and dict')
+
+    mapping = {f'key-{i}': f'value-{i}' for i in range(size)}
+    seconds = timed(lambda: [cursor.cursor.set(k, v, ex = 600) for k, v in mapping.items()])
+    print(f'{"set per key":>12}: {seconds:7.3f}s for {size} string keys')
+    print(f'{"bulk_set":>12}: {timed(cursor.bulk_set, mapping, 600):7.3f}s for {size} string keys')
+    cursor.close()
+
+
+def bench_scan_drop(size: int = 1_000_000):
+    '''
+    Listing and deleting `size` keys, KEYS * vs SCAN and per-key DEL vs batched UNLINK
+    '''
+    cursor = redis_cursor()
+    for start in range(0, size, 100000):
+        cursor.bulk_set({f'key-{i}': i for i in range(start, min(start + 100000, size))})
+
+    print(f'{"KEYS *":>16}: {timed(cursor.cursor.keys, "*"):7.3f}s blocking in one command')
+    print(f'{"iter_keys":>16}: {timed(lambda: sum(1 for _ in cursor.iter_keys())):7.3f}s total, '
+          f'no single blocking command')
+
+    def previous_drop(key: str):
+        if key in [i.decode() for i in cursor.cursor.keys('*')]:
+            cursor.cursor.delete(key)
+
+    keys = [f'key-{i}' for i in range(0, size, 1000)]
+    seconds = timed(lambda: [previous_drop(key) for key in keys])
+    print(f'{"KEYS + DEL":>16}: {seconds / len(keys) * 1e3:7.2f} ms/key (previous drop)')
+    seconds = timed(lambda: [cursor.drop(f'key-{i + 1}') for i in range(0, size, 1000)])
+    print(f'{"EXISTS + UNLINK":>16}: {seconds / len(keys) * 1e3:7.2f} ms/key')
+    print(f'{"drop pattern":>16}: {timed(cursor.drop, pattern = "key-*"):7.3f}s for the rest')
+    cursor.close()
+
+
+def bench_typed_read(size: int = 1000):
+    '''
+    Per-key latency of mixed-type reads, EXISTS + TYPE + read vs one script call vs batched `get_many`
+    '''
+    cursor = redis_cursor()
+    kinds = ('value', ['a', 'b', 'c'], {'x': '1', 'y': '2'}, {'p', 'q'})
+    cursor.bulk_set({f'key-{i}': kinds[i % len(kinds)] for i in range(size)})
+    keys = [f'key-{i}' for i in range(size)]
+
+    def previous_read(key: str):
+        cursor.cursor.exists(key)
+        match cursor.cursor.type(key):
+            case b'string': cursor.cursor.get(key)
+            case b'list': cursor.cursor.lrange(key, 0, -1)
+            case b'hash': cursor.cursor.hgetall(key)
+            case b'set': cursor.cursor.smembers(key)
+
+    for label, run in (
+        ('3 round trips', lambda: [previous_read(key) for key in keys]),
+        ('script', lambda: [cursor[key] for key in keys]),
+        ('get_many', lambda: cursor.get_many(keys)),
+    ):
+        print(f'{label:>14}: {timed(run) / size * 1e6:8.1f} us/key')
+    cursor.close()
+
+
+def bench_client_cache(reads: int = 100000):
+    '''
+    Hot key reads without and with the tracked local cache, one write per 1000 reads
+    '''
+    cursor = redis_cursor()
+    cached = Rain_Dis(os.environ.get('REDIS_HOST', 'localhost'), int(os.environ.get('REDIS_PORT', 6379)), db = 15,
+                      client_cache = True, cache_prefixes = ['cfg:'])
+    cursor.bulk_set({f'cfg:{i}': f'value-{i}' for i in range(100)})
+
+    for label, reader in (('no cache', cursor), ('client cache', cached)):
+        start_time = time.perf_counter()
+        for i in range(reads):
+            reader[f'cfg:{i % 100}']
+            if i % 1000 == 0:
+                cursor[f'cfg:{i % 100}'] = f'changed-{i}'
+        seconds = time.perf_counter() - start_time
+        print(f'{label:>12}: {reads / seconds:9.0f} reads/s  {seconds / reads * 1e6:6.1f} us/read')
+    print(f'{"stats":>12}: {cached.client_cache.stats}')
+    cached.close()
+    cursor.close()
+
+
+def bench_codecs(rows: int = 100000):
+    '''
+    Stored bytes and read time of a `rows` row query result, native list vs codecs vs DataFrame blobs
+    '''
+    cursor = redis_cursor()
+    rng = np.random.default_rng(5)
+    frame = pd.DataFrame({
+        'user_id': rng.integers(0, 1_000_000, rows),
+        'score': rng.random(rows).round(4),
+        'city': np.array(['Beijing', 'Shanghai', 'Nanyang', 'Wuhan', 'Xian'])[rng.integers(0, 5, rows)],
+    })
+    records = frame.values.tolist()
+
+    def report(label: str, read):
+        seconds = timed(read)
+        print(f'{label:>16}: {cursor.cursor.memory_usage("value") / 1024 ** 2:7.2f} MB  read {seconds * 1e3:8.1f} ms')
+
+    cursor.set('value', [','.join(map(str, row)) for row in records])
+    report('native list', lambda: cursor['value'])
+    for codec in (Codec('msgpack'), Codec('msgpack', 'zstd'),
+                  Codec('pickle', 'lz4', allow_pickle = True), Codec('pickle', 'zlib', allow_pickle = True)):
+        cursor.set('value', records, codec = codec)
+        report(f'{codec.serializer}+{codec.compression}', lambda: cursor.get('value', codec))
+    for format, compression in (('arrow', None), ('arrow', 'zstd'), ('parquet', 'zstd')):
+        cursor.put_frame('value', frame, format = format, compression = compression)
+        report(f'{format}+{compression}', lambda: cursor.get_frame('value'))
+    cursor.close()
+
+
+def bench_async_reads(reads: int = 20000, concurrency: int = 64):
+    '''
+    Concurrent reads, threads over one `Rain_Dis` vs `AsyncRain_Dis` tasks on a shared pool
+    '''
+    from func.async_database import AsyncRain_Dis, dispose_redis_pools
+
+    cursor = redis_cursor()
+    cursor.bulk_set({f'key-{i}': f'value-{i}' for i in range(1000)})
+    keys = [f'key-{i % 1000}' for i in range(reads)]
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(cursor.__getitem__, keys))
+    seconds = time.perf_counter() - start_time
+    print(f'{"threaded sync":>14}: {reads / seconds:8.0f} reads/s')
+
+    async def fanout(batched: bool) -> float:
+        async_cursor = AsyncRain_Dis(os.environ.get('REDIS_HOST', 'localhost'), int(os.environ.get('REDIS_PORT', 6379)),
+                                     db = 15, pool = {'max_connections': concurrency})
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def read(key_slice: list[str]):
+            async with semaphore:
+                if batched:
+                    return await async_cursor.get_many(key_slice)
+                return await async_cursor.get(key_slice[0])
+
+        size = 100 if batched else 1
+        start_time = time.perf_counter()
+        await asyncio.gather(*(read(keys[i: i + size]) for i in range(0, reads, size)))
+        seconds = time.perf_counter() - start_time
+        await async_cursor.close()
+        await dispose_redis_pools()
+        return seconds
+
+    for label, batched in (('async get', False), ('async get_many', True)):
+        seconds = asyncio.run(fanout(batched))
+        print(f'{label:>14}: {reads / seconds:8.0f} reads/s')
+    cursor.close()
+
+
+def _query_worker(path: str, cached: bool, queries: int) -> dict:
+    '''
+    One worker process running the same aggregate `queries` times
+    '''
+    dis = Rain_Dis(os.environ.get('REDIS_HOST', 'localhost'), int(os.environ.get('REDIS_PORT', 6379)), db = 15)
+    db = Rain_DB(f'sqlite:///{path}', cache = dis if cached else None)
+    for _ in range(queries):
+        db.exec('select city, count(*), avg(score) from bench group by city', True)
+    return db.cache.stats if cached else {}
+
+
+def bench_shared_query_cache(rows: int = 1_000_000, workers: int = 8, queries: int = 20):
+    '''
+    `workers` processes repeating one aggregate over `rows` rows, without and with the shared redis cache
+    '''
+    redis_cursor().close()
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    db = Rain_DB(f'sqlite:///{path}')
+    rng = np.random.default_rng(5)
+    for start in range(0, rows, 200000):
+        size = min(200000, rows - start)
+        pd.DataFrame({
+            'score': rng.random(size),
+            'city': np.array(['Beijing', 'Shanghai', 'Nanyang', 'Wuhan', 'Xian'])[rng.integers(0, 5, size)],
+        }).to_sql('bench', db.engine, if_exists = 'append', index = False)
+
+    for cached in (False, True):
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(workers) as executor:
+            stats = list(executor.map(_query_worker, [path] * workers, [cached] * workers, [queries] * workers))
+        seconds = time.perf_counter() - start_time
+        label = 'redis cache' if cached else 'no cache'
+        loads = sum(i.get('misses', workers * queries) - i.get('waits', 0) for i in stats) if cached else workers * queries
+        print(f'{label:>12}: {seconds:7.2f}s  {loads} queries ran for {workers * queries} reads')
+    db.close()
+
+
+if __name__ == '__main__':
+    bench_name = sys.argv[1] if len(sys.argv) > 1 else 'pipelined_set'
+    bench_args = [int(i) for i in sys.argv[2:]]
+    globals()[f'bench_{bench_name}'](*bench_args)
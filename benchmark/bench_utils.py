@@ -0,0 +1,147 @@
+'''
+Utils Benchmarks
+
+Usage:
+    python benchmark/bench_utils.py <bench_name> [size]
+
+QR benchmarks draw text with the TrueType font at $QR_FONT (default DejaVuSans.ttf).
+'''
+import io, os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from utils.format import Formater
+from utils.utils import (
+    generate_qrcodes, aes_encrypt, aes_decrypt,
+    aes_encrypt_stream, aes_decrypt_stream, aes_encrypt_many, aes_decrypt_many,
+)
+
+
+def timed(func, *args, **kwargs) -> tuple:
+    '''
+    Run `func` once, return (result, seconds)
+    '''
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def bench_format_dates(size: int = 1_000_000):
+    '''
+    `size` conversions, scalar `format_date` loop vs `format_dates` batch
+    '''
+    rng = np.random.default_rng(5)
+    epochs = rng.uniform(0, 2e9, size).round()
+    strings = [time.ctime(i) for i in epochs[:size]]
+    iso = pd.Series(pd.to_datetime(epochs, unit = 's')).dt.strftime('%Y-%m-%dT%H:%M:%S+08:00').tolist()
+
+    for label, targets in (('epoch floats', epochs), ('ctime strings', strings)):
+        scalar, scalar_seconds = timed(lambda: [Formater.format_date(float(i) if label == 'epoch floats' else i, 'all', 'china') for i in targets])
+        batch, batch_seconds = timed(Formater.format_dates, targets, 'all', 'china')
+        assert list(batch) == scalar
+        print(f'{label:>14}: scalar {scalar_seconds:6.2f}s  batch {batch_seconds:6.2f}s  '
+              f'({scalar_seconds / batch_seconds:5.1f}x)')
+
+    _, seconds = timed(Formater.format_dates, iso, 'all', 'china')
+    print(f'{"iso-8601":>14}: batch {seconds:6.2f}s (no scalar parser)')
+    for keyword in ('day', 'week', '%H:%M'):
+        _, seconds = timed(Formater.format_dates, epochs, keyword)
+        print(f'{keyword:>14}: batch {seconds:6.2f}s')
+
+
+def bench_qrcodes(size: int = 5000):
+    '''
+    Labels/sec of `size` text labels, a per-label QRCode + font load loop vs `generate_qrcodes` at 1, 4 and N workers
+    '''
+    import qrcode
+    from PIL import Image, ImageDraw, ImageFont
+
+    font_style = {'font': os.environ.get('QR_FONT', 'DejaVuSans.ttf'), 'size': 16}
+    items = [(f'asset-{i}', f'http://oa.nsyy.com.cn:6060/?id={i}', ['Asset', f'{i:06d}']) for i in range(size)]
+
+    def previous_label(qr_info: str, add_info: list) -> bytes:
+        qr = qrcode.QRCode(version = 4)
+        qr.add_data(qr_info)
+        qr.make(fit = True)
+        qr_image = qr.make_image(fill_color = 'black', back_color = 'white').get_image()
+        font = ImageFont.truetype(**font_style)
+        image = Image.new('RGB', (qr_image.size[0] + 120, qr_image.size[1]), 'white')
+        image.paste(qr_image, (0, 0))
+        drawer = ImageDraw.Draw(image)
+        for index, tiny in enumerate(add_info):
+            drawer.text((qr_image.size[0] + index * 25, 100), tiny, font = font, fill = 'black')
+        buffer = io.BytesIO()
+        image.save(buffer, 'png')
+        return buffer.getvalue()
+
+    count = min(size, 1000)
+    _, seconds = timed(lambda: [previous_label(qr_info, add_info) for _, qr_info, add_info in items[:count]])
+    print(f'{"per label":>14}: {count / seconds:8.0f} labels/s')
+
+    out_dir = tempfile.mkdtemp()
+    for workers in sorted({1, 4, os.cpu_count()}):
+        for target in ('dir', 'zip'):
+            path = os.path.join(out_dir, f'{workers}-{target}' + ('.zip' if target == 'zip' else ''))
+            written, seconds = timed(generate_qrcodes, items, path, workers, font_style = font_style)
+            print(f'{f"{workers} workers {target}":>14}: {written / seconds:8.0f} labels/s')
+
+
+def bench_aes_stream(size_mb: int = 256):
+    '''
+    MB/s of encrypting and decrypting a `size_mb` file per mode, vs the in-memory base64 `aes_encrypt` of one string
+    '''
+    import tracemalloc
+    from Crypto.Random import get_random_bytes
+
+    key = get_random_bytes(32)
+    out_dir = tempfile.mkdtemp()
+    path = os.path.join(out_dir, 'plain.bin')
+    with open(path, 'wb') as file:
+        for _ in range(size_mb):
+            file.write(os.urandom(1024 ** 2))
+
+    count = min(size_mb, 64)
+    text = os.urandom(count * 1024 ** 2).decode('latin-1')
+    encrypted, seconds = timed(aes_encrypt, text, key)
+    print(f'{"in-memory cbc":>14}: {count / seconds:7.1f} MB/s encrypt  '
+          f'{count / timed(aes_decrypt, encrypted, key)[1]:7.1f} MB/s decrypt  ({count} MB, base64 +33%)')
+    del text, encrypted
+
+    for mode in ('cbc', 'ctr', 'gcm'):
+        target = os.path.join(out_dir, f'{mode}.aes')
+        tracemalloc.start()
+        _, encrypt_seconds = timed(aes_encrypt_stream, path, target, key, mode)
+        _, decrypt_seconds = timed(aes_decrypt_stream, target, os.path.join(out_dir, 'back.bin'), key, mode)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{f"stream {mode}":>14}: {size_mb / encrypt_seconds:7.1f} MB/s encrypt  '
+              f'{size_mb / decrypt_seconds:7.1f} MB/s decrypt  peak {peak / 1024 ** 2:5.1f} MB')
+
+
+def bench_aes_many(size: int = 200000):
+    '''
+    `size` short strings, `aes_encrypt` loop vs `aes_encrypt_many` / `aes_decrypt_many` at 1, 4 and N workers
+    '''
+    from Crypto.Random import get_random_bytes
+
+    key = get_random_bytes(32)
+    texts = [f'patient-{i:08d}|13800000000|Nanyang' for i in range(size)]
+    megabytes = sum(len(i) for i in texts) / 1024 ** 2
+
+    _, seconds = timed(lambda: [aes_encrypt(text, key) for text in texts])
+    print(f'{"loop":>10}: {size / seconds:9.0f} texts/s  {megabytes / seconds:6.2f} MB/s encrypt')
+    for workers in sorted({1, 4, os.cpu_count()}):
+        encrypted, seconds = timed(aes_encrypt_many, texts, key, workers)
+        decrypted, decrypt_seconds = timed(aes_decrypt_many, encrypted, key, workers)
+        assert decrypted == texts
+        print(f'{f"{workers} workers":>10}: {size / seconds:9.0f} texts/s  {megabytes / seconds:6.2f} MB/s encrypt  '
+              f'{megabytes / decrypt_seconds:6.2f} MB/s decrypt')
+
+
+if __name__ == '__main__':
+    bench_name = sys.argv[1] if len(sys.argv) > 1 else 'format_dates'
+    bench_args = [int(i) for i in sys.argv[2:]]
+    globals()[f'bench_{bench_name}'](*bench_args)
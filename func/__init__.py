@@ -1 +1 @@
-from .curd import Table
\ No newline at end of file
+from .database import Rain_DB, Rain_Dis
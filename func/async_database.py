@@ -0,0 +1,488 @@
+import asyncio, time, threading
+import pandas as pd
+import redis.asyncio
+
+from typing import Literal, Iterable, AsyncIterator
+
+from sqlalchemy import URL, MetaData, Table, Connection, inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from .database import Rain_DB, Rain_Dis, _text
+from .codec import Codec
+
+
+# async driver of each backend, used when the url names no driver
+async_drivers = {'sqlite': 'aiosqlite', 'mysql': 'aiomysql', 'postgresql': 'asyncpg'}
+
+# process-wide async engines keyed by url, connect args and pool settings
+_async_engine_registry: dict[tuple, AsyncEngine] = {}
+_async_engine_lock = threading.Lock()
+
+
+def get_async_engine(url: URL | str, connect_args: dict | None = None, **pool_args) -> AsyncEngine:
+    '''
+    Get the shared AsyncEngine of `url`, created on first use.
+
+    Engines (and their pooled connections) belong to the event loop that first uses them.
+    '''
+    from sqlalchemy.engine.url import make_url
+
+    url = make_url(url)
+    if '+' not in url.drivername and url.drivername in async_drivers:
+        url = url.set(drivername = f'{url.drivername}+{async_drivers[url.drivername]}')
+
+    connect_args = connect_args or {}
+    key = (
+        url.render_as_string(hide_password = False),
+        repr(sorted(connect_args.items())), repr(sorted(pool_args.items())),
+    )
+    with _async_engine_lock:
+        if key not in _async_engine_registry:
+            _async_engine_registry[key] = create_async_engine(url, connect_args = connect_args, **pool_args)
+        return _async_engine_registry[key]
+
+
+async def dispose_async_engines() -> None:
+    '''
+    Dispose and forget every shared AsyncEngine
+    '''
+    with _async_engine_lock:
+        engines = list(_async_engine_registry.values())
+        _async_engine_registry.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+# process-wide redis connection pools keyed by server, db and pool settings
+_redis_pool_registry: dict[tuple, redis.asyncio.ConnectionPool] = {}
+
+
+def get_redis_pool(host: str, port: int, db = 0, pw = None, timeout = 5000, **pool_args) -> redis.asyncio.ConnectionPool:
+    '''
+    Get the shared asyncio redis ConnectionPool of a server and db, created on first use.
+
+    `pool_args` go to the pool, e.g. `max_connections`; like async engines, a pool belongs 
+    to the event loop that first uses it.
+    '''
+    key = (host, port, db, pw, timeout, repr(sorted(pool_args.items())))
+    with _async_engine_lock:
+        if key not in _redis_pool_registry:
+            _redis_pool_registry[key] = redis.asyncio.ConnectionPool(
+                host = host, port = port, db = db, password = pw, socket_timeout = timeout, **pool_args)
+        return _redis_pool_registry[key]
+
+
+async def dispose_redis_pools() -> None:
+    '''
+    Disconnect and forget every shared redis pool
+    '''
+    with _async_engine_lock:
+        pools = list(_redis_pool_registry.values())
+        _redis_pool_registry.clear()
+    for pool in pools:
+        await pool.disconnect()
+
+
+class AsyncRain_Dis:
+    '''
+    An Asyncio Redis Cursor Based On redis.asyncio.
+
+    Same semantics as `Rain_Dis` with awaitable methods, instances of one server and db
+    share a connection pool (see `get_redis_pool`).
+
+    Example:
+    ------
+    >>> cursor = AsyncRain_Dis('localhost', 6379, pool = {'max_connections': 64})
+    >>> await cursor.set('a', '1', 2000)
+    >>> await cursor.bulk_set({'b': [2, 4], 'c': {'x': '1'}}, ttl = 600)
+    >>> await cursor.get_many(['a', 'b', 'c'])
+    >>> await cursor.drop(pattern = 'session:*')
+    '''
+
+    def __init__(self, host: str, port: int, db = 0, pw = None, timeout = 5000, encoding = 'utf-8',
+                 pool: dict | None = None, codec: Codec | None = None) -> None:
+        self.encoding = encoding
+        self.codec = codec
+        self.cursor = redis.asyncio.StrictRedis(connection_pool = get_redis_pool(host, port, db, pw, timeout, **(pool or {})))
+        self._read = self.cursor.register_script(Rain_Dis.read_script)
+
+    async def iter_keys(self, pattern: str = '*', count: int = 1000) -> AsyncIterator[str]:
+        '''
+        Lazily iterate keys matching `pattern` through SCAN, see `Rain_Dis.iter_keys`
+        '''
+        async for key in self.cursor.scan_iter(match = pattern, count = count):
+            yield key.decode(self.encoding)
+
+    async def keys(self, pattern: str = '*') -> tuple:
+        # SCAN may repeat keys
+        return tuple(dict.fromkeys([key async for key in self.iter_keys(pattern)]))
+
+    async def exists(self, key) -> bool:
+        return await self.cursor.exists(key) == 1
+
+    async def get(self, key, codec: Codec | None = None):
+        '''
+        Typed read in one round trip, see `Rain_Dis.get`
+        '''
+        reply = await self._read(keys = [key])
+        if reply[0] == b'none':
+            raise KeyError('Can\'t find the Key in Redis!')
+        return Rain_Dis._decode(self, reply, codec)
+
+    async def get_many(self, keys: Iterable[str], batch_size: int = 1000) -> dict:
+        '''
+        Read many keys of mixed types, see `Rain_Dis.get_many`
+        '''
+        values, keys = {}, list(keys)
+        for start in range(0, len(keys), batch_size):
+            async with self.cursor.pipeline(transaction = False) as pipe:
+                for key in keys[start: start + batch_size]:
+                    await self._read(keys = [key], client = pipe)
+                replies = await pipe.execute()
+            for key, reply in zip(keys[start: start + batch_size], replies):
+                if reply[0] != b'none':
+                    values[key] = Rain_Dis._decode(self, reply)
+        return values
+
+    async def set(self, key, value, livetime: int | None = None, codec: Codec | None = None) -> bool:
+        '''
+        Replace `key` with `value` in one MULTI / EXEC round trip, see `Rain_Dis.set`
+        '''
+        codec = codec or self.codec
+        async with self.cursor.pipeline(transaction = True) as pipe:
+            if codec is not None:
+                pipe.set(key, codec.encode(value), ex = livetime)
+            else:
+                Rain_Dis._queue_set(pipe, key, value, livetime)
+            await pipe.execute()
+        return True
+
+    async def bulk_set(self, mapping: dict, ttl: int | None = None) -> bool:
+        '''
+        Write many keys in one MULTI / EXEC round trip, see `Rain_Dis.bulk_set`
+        '''
+        if self.codec is not None:
+            scalars = {k: self.codec.encode(v) for k, v in mapping.items()}
+        else:
+            scalars = {k: v for k, v in mapping.items() if isinstance(v, (int, float, str, bytes))}
+        async with self.cursor.pipeline(transaction = True) as pipe:
+            if scalars:
+                pipe.mset(scalars)
+                if ttl is not None:
+                    for key in scalars:
+                        pipe.expire(key, ttl)
+            for key, value in mapping.items():
+                if key not in scalars:
+                    Rain_Dis._queue_set(pipe, key, value, ttl)
+            await pipe.execute()
+        return True
+
+    async def put_frame(self, key, frame: pd.DataFrame, livetime: int | None = None,
+                        format: Literal['arrow', 'parquet'] = 'arrow', compression: str | None = 'zstd') -> bool:
+        return await self.set(key, frame, livetime, codec = Codec(format, compression))
+
+    async def get_frame(self, key) -> pd.DataFrame:
+        frame = await self.get(key, Codec('arrow'))
+        if not isinstance(frame, pd.DataFrame):
+            raise TypeError(f'Key {key} holds {type(frame).__name__}, not a DataFrame')
+        return frame
+
+    async def drop(self, keys: str | Iterable[str] | None = None, pattern: str | None = None, batch_size: int = 1000) -> int:
+        '''
+        Delete one key, many keys or every key matching `pattern` with batched UNLINK, see `Rain_Dis.drop`
+        '''
+        if isinstance(keys, str):
+            if not await self.exists(keys):
+                raise KeyError('Can\'t find the key in Redis!')
+            return await self.cursor.unlink(keys)
+
+        async def unlink(batches: list[list]) -> int:
+            async with self.cursor.pipeline(transaction = False) as pipe:
+                for batch in batches:
+                    pipe.unlink(*batch)
+                return sum(await pipe.execute())
+
+        async def source() -> AsyncIterator[str]:
+            if pattern is not None:
+                async for key in self.iter_keys(pattern, batch_size):
+                    yield key
+            else:
+                for key in keys or ():
+                    yield key
+
+        count, batches, batch = 0, [], []
+        async for key in source():
+            batch.append(key)
+            if len(batch) == batch_size:
+                batches.append(batch); batch = []
+                if len(batches) == 10:
+                    count += await unlink(batches); batches = []
+        if batch:
+            batches.append(batch)
+        if batches:
+            count += await unlink(batches)
+        return count
+
+    async def close(self) -> None:
+        '''
+        Release this cursor, the shared pool stays open for other instances
+        '''
+        await self.cursor.aclose()
+
+
+class AsyncRain_DB:
+    '''
+    An Asyncio Database Cursor Based On SqlAlchemy Async Engine.
+
+    Same surface as `Rain_DB` with awaitable methods; the url may name an async driver
+    (`sqlite+aiosqlite`, `mysql+aiomysql`, `postgresql+asyncpg`) or leave it to the default one.
+
+    Every call checks out its own pooled connection, so writes commit by default
+    instead of waiting for a later `commit`.
+
+    Example:
+    ------
+    >>> db = AsyncRain_DB('sqlite:////absolute/path/to/foo.db')
+    >>> await db.create_table('person_info', {'name': 'varchar(32)', 'age': 'int'})
+    >>> await db.insert([{'name': 'Alice', 'age': 16}, {'name': 'Bob', 'age': 12}])
+    >>> frames = await db.gather([f'select * from person_info where age > {i}' for i in range(20)], True, limit = 8)
+    '''
+
+    def __init__(self, config: URL | dict | str,
+                 table_name: str = '',
+                 encoding: str = 'utf8',
+                 pool: dict | None = None) -> None:
+        conn_url, conn_para, pool = Rain_DB._parse_config(config, encoding, pool)
+        self.engine = get_async_engine(conn_url, conn_para, **pool)
+        self.system = self.engine.dialect.name
+        self._curr_database = self.engine.url.database
+        self.curr_table = table_name
+        # rows / seconds / rows_per_sec of the latest bulk write
+        self.write_stats: dict = {}
+
+        # reflected tables are cached per table on first access, see `_table_meta`
+        self._metadata = MetaData()
+        self._table_names: tuple | None = None
+
+    @property
+    def curr_database(self):
+        return self._curr_database
+
+    async def tables(self) -> tuple:
+        '''
+        All tables and views name tuple
+        '''
+        def list_names(conn: Connection) -> tuple:
+            inspector = inspect(conn)
+            return tuple(inspector.get_table_names()) + tuple(inspector.get_view_names())
+
+        if self._table_names is None:
+            async with self.engine.connect() as conn:
+                self._table_names = await conn.run_sync(list_names)
+        return self._table_names
+
+    async def _table_meta(self, table_name: str) -> Table:
+        '''
+        Reflected Table of `table_name`, reflecting only this table on first access
+        '''
+        if table_name not in self._metadata.tables:
+            if table_name not in await self.tables():
+                raise KeyError(f"Can't find table {table_name} in current database;")
+            async with self.engine.connect() as conn:
+                await conn.run_sync(self._metadata.reflect, only = [table_name], views = True)
+        return self._metadata.tables[table_name]
+
+    def _invalidate_metadata(self, table_name: str | None = None) -> None:
+        '''
+        Drop cached reflection after DDL, the whole cache when `table_name` is None
+        '''
+        self._table_names = None
+        if table_name is None:
+            self._metadata = MetaData()
+        elif table_name in self._metadata.tables:
+            self._metadata.remove(self._metadata.tables[table_name])
+
+    @staticmethod
+    def _run(conn: Connection, sql: str, trans_df: bool, params: dict | list[dict] | None) -> list | pd.DataFrame | bool:
+        '''
+        Execute inside `run_sync` and fetch the result the same way as `Rain_DB.exec`
+        '''
+        result = conn.execute(_text(sql), params)
+        if not result.returns_rows:
+            return True
+        if trans_df:
+            return Rain_DB._fetch_frame(result)
+        return [tuple(result.keys())] + [tuple(row) for row in result]
+
+    async def exec(self, sql: str, trans_df: bool = False, commit: bool = True,
+                   params: dict | list[dict] | None = None) -> list | pd.DataFrame | bool:
+        '''
+        Execute SQL Query, see `Rain_DB.exec`
+
+        `commit` -- commit the statement, otherwise it's rolled back when the connection returns to pool;
+        '''
+        try:
+            async with self.engine.connect() as conn:
+                final_info = await conn.run_sync(self._run, sql, trans_df, params)
+                if commit:
+                    await conn.commit()
+
+            if (ddl := Rain_DB.ddl_pattern.match(sql)) is not None:
+                table_name = ddl.group(2) if ddl.group(1).lower() != 'use' else None
+                self._invalidate_metadata(table_name and table_name.split('.')[-1])
+            return final_info
+
+        except Exception as e:
+            print(f'Running SQL Code:{sql}\n', f'Error Info: {e}')
+
+            if Rain_DB.write_pattern.match(sql):
+                return False
+
+    async def exec_iter(self, sql: str, chunksize: int = 10000, trans_df: bool = False,
+                        table_name: str | None = None, params: dict | None = None) -> AsyncIterator[tuple | pd.DataFrame]:
+        '''
+        Execute SQL Query And Stream The Result, see `Rain_DB.exec_iter`
+
+        >>> async for df in db.exec_iter('select * from person_info;', 50000, True):
+        ...     print(len(df))
+        '''
+        table = await self._table_meta(table_name) if table_name else None
+        async with self.engine.connect() as conn:
+            result = await conn.stream(_text(sql), params, execution_options = {'yield_per': chunksize})
+            columns = tuple(result.keys())
+            dtypes = Rain_DB._column_dtypes(table, columns)
+            async for rows in result.partitions(chunksize):
+                if trans_df:
+                    yield pd.DataFrame({
+                        name: Rain_DB._to_array(values, dtypes[name]) for name, values in zip(columns, zip(*rows))
+                    }, columns = columns).infer_objects()
+                else:
+                    for row in rows:
+                        yield tuple(row)
+
+    async def gather(self, queries: Iterable[str], trans_df: bool = False, limit: int = 10) -> list:
+        '''
+        Run many queries concurrently, at most `limit` at once, results keep the query order
+        '''
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run_one(sql: str):
+            async with semaphore:
+                return await self.exec(sql, trans_df)
+
+        return await asyncio.gather(*(run_one(sql) for sql in queries))
+
+    async def get_table(self,
+        table_name: str = '',
+        need_type: Literal['dataframe', 'table'] = 'dataframe',
+        ) -> pd.DataFrame | Table:
+        '''
+        Get Target Table Object.
+        '''
+        if table_name == '': table_name = self.curr_table
+        table = await self._table_meta(table_name)
+
+        if need_type == 'table':
+            return table
+
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: Rain_DB._fetch_frame(sync_conn.execute(select(table)), table))
+
+    async def create_table(self, table_name: str, columns: dict) -> bool:
+        '''
+        Create New Table in current Database, see `Rain_DB.create_table`
+        '''
+        assert table_name not in await self.tables(), f"Found Existed Table!"
+
+        try:
+            meta = MetaData()
+            Table(table_name, meta, *Rain_DB._gene_columns(columns))
+            async with self.engine.begin() as conn:
+                await conn.run_sync(meta.create_all)
+            self._invalidate_metadata(table_name)
+            self.curr_table = table_name
+            return True
+        except Exception as e:
+            print(e); return False
+
+    async def insert(self, data: list[dict] | pd.DataFrame, table_name: str = '',
+                     chunksize: int = 10000) -> tuple[bool, str]:
+        '''
+        Insert Data Into Existed Table, see `Rain_DB.insert`
+        '''
+        if table_name == '':
+            table_name = self.curr_table
+        if table_name not in await self.tables():
+            return False, 'Check Unexisted Table'
+
+        table = await self._table_meta(table_name)
+        data_columns = set(data.columns) if isinstance(data, pd.DataFrame) else set().union(*data)
+        if not data_columns <= set(table.columns.keys()):
+            return False, 'Check Column Error'
+
+        start_time, count = time.perf_counter(), 0
+        try:
+            for rows in Rain_DB._iter_records(data, chunksize):
+                async with self.engine.begin() as conn:
+                    count += await conn.run_sync(Rain_DB._insert_rows, table, rows)
+        except Exception as e:
+            self.write_stats, _ = Rain_DB._throughput(count, start_time)
+            return False, f'Insert Error After {count} Rows: {e}'
+
+        self.write_stats, info = Rain_DB._throughput(count, start_time)
+        return True, info
+
+    async def update(self,
+        data: list[dict] | pd.DataFrame,
+        primary_key: str,
+        table_name: str = '',
+        chunksize: int = 10000,
+        case_threshold: int = 200, ) -> bool:
+        '''
+        Update Existed Rows Matched By `primary_key`, see `Rain_DB.update`
+        '''
+        if table_name == '':
+            table_name = self.curr_table
+        assert table_name in await self.tables(), f'Nonexistent Table {table_name}'
+
+        table = await self._table_meta(table_name)
+        start_time, count = time.perf_counter(), 0
+        try:
+            async with self.engine.connect() as conn:
+                for rows in Rain_DB._iter_records(data, chunksize):
+                    async with conn.begin():
+                        count += await conn.run_sync(Rain_DB._update_rows, table, rows, primary_key, case_threshold)
+            self.write_stats, _ = Rain_DB._throughput(count, start_time)
+            return True
+        except Exception as e:
+            self.write_stats, _ = Rain_DB._throughput(count, start_time)
+            print(f"Error updating data: {e}")
+            return False
+
+    async def upsert(self,
+        data: list[dict] | pd.DataFrame,
+        key_columns: str | list[str],
+        table_name: str = '',
+        chunksize: int = 10000, ) -> tuple[bool, str]:
+        '''
+        Insert Rows, Replacing Existed Ones Matched By `key_columns`, see `Rain_DB.upsert`
+        '''
+        if table_name == '':
+            table_name = self.curr_table
+        if table_name not in await self.tables():
+            return False, 'Check Unexisted Table'
+
+        key_columns = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+        table = await self._table_meta(table_name)
+        start_time, inserted, updated = time.perf_counter(), 0, 0
+        try:
+            for rows in Rain_DB._iter_records(data, chunksize):
+                async with self.engine.begin() as conn:
+                    new, old = await conn.run_sync(Rain_DB._upsert_rows, table, rows, key_columns)
+                inserted, updated = inserted + new, updated + old
+        except Exception as e:
+            self.write_stats, _ = Rain_DB._throughput(inserted + updated, start_time, inserted = inserted, updated = updated)
+            return False, f'Upsert Error After {inserted + updated} Rows: {e}'
+
+        self.write_stats, info = Rain_DB._throughput(inserted + updated, start_time, inserted = inserted, updated = updated)
+        return True, f'{info}, {inserted} inserted, {updated} updated'
@@ -0,0 +1,155 @@
+import io, pickle, zlib
+import pandas as pd
+
+
+class Codec:
+    '''
+    Value Codec Of Rain_Dis
+
+    A value is serialized into one blob behind a 4 byte header (magic, serializer id,
+    compression id), so a blob reads back whatever codec the reader was configured with.
+
+    Serializers:
+
+        `raw` -- bytes (str is utf-8 encoded), read back as bytes;
+
+        `msgpack` -- compact, language neutral, nested containers of plain types;
+
+        `pickle` -- any picklable python object; unpickling runs code chosen by whoever wrote
+            the blob, so it is only written and read back with `allow_pickle = True`;
+
+        `arrow` / `parquet` -- a pandas DataFrame as one Arrow IPC stream / Parquet file,
+            compressed by the format itself;
+
+    Compressions: `zlib`, `zstd` (zstandard package), `lz4` (lz4 package),
+    payloads under `min_size` bytes are stored uncompressed.
+
+    Example:
+    ------
+    >>> codec = Codec('msgpack', 'zstd')
+    >>> codec.decode(codec.encode({'a': [1, 2, {'b': None}]}))
+        {'a': [1, 2, {'b': None}]}
+    >>> codec = Codec('pickle', 'zlib', allow_pickle = True)   # only for trusted writers
+    '''
+    magic = b'\x00R'
+    # position is the id written into the header
+    serializers = ('raw', 'msgpack', 'pickle', 'arrow', 'parquet')
+    compressions = (None, 'zlib', 'zstd', 'lz4')
+
+    def __init__(self, serializer: str = 'msgpack', compression: str | None = None,
+                 level: int | None = None, min_size: int = 256, allow_pickle: bool = False) -> None:
+        if serializer not in self.serializers:
+            raise ValueError(f'Unknown serializer {serializer}, expect one of {self.serializers}')
+        if serializer == 'pickle' and not allow_pickle:
+            # it couldn't read back its own blobs
+            raise ValueError('Pickle codec needs allow_pickle = True')
+        if compression not in self.compressions:
+            raise ValueError(f'Unknown compression {compression}, expect one of {self.compressions}')
+        self.serializer = serializer
+        self.compression = compression
+        self.level = level
+        self.min_size = min_size
+        self.allow_pickle = allow_pickle
+
+    def __repr__(self) -> str:
+        return f'Codec({self.serializer!r}, {self.compression!r})'
+
+    @classmethod
+    def is_encoded(cls, blob: bytes) -> bool:
+        return len(blob) >= 4 and blob[:2] == cls.magic
+
+    def _serialize(self, value) -> bytes:
+        match self.serializer:
+            case 'raw':
+                if not isinstance(value, (bytes, str)):
+                    raise TypeError(f'Raw codec stores bytes or str, not {type(value).__name__}')
+                return value.encode() if isinstance(value, str) else value
+
+            case 'msgpack':
+                import msgpack
+                return msgpack.packb(value, use_bin_type = True)
+
+            case 'pickle':
+                return pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+
+            case 'arrow' | 'parquet':
+                import pyarrow as pa, pyarrow.parquet as pq
+
+                if not isinstance(value, pd.DataFrame):
+                    raise TypeError(f'{self.serializer} codec stores DataFrame, not {type(value).__name__}')
+                table = pa.Table.from_pandas(value)
+                sink = pa.BufferOutputStream()
+                if self.serializer == 'parquet':
+                    pq.write_table(table, sink, compression = {'zlib': 'gzip'}.get(self.compression, self.compression or 'snappy'))
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression = self.compression if self.compression in ('zstd', 'lz4') else None)
+                    with pa.ipc.new_stream(sink, table.schema, options = options) as writer:
+                        writer.write_table(table)
+                return sink.getvalue().to_pybytes()
+
+    @classmethod
+    def _deserialize(cls, serializer: str, payload: bytes):
+        match serializer:
+            case 'raw':
+                return payload
+
+            case 'msgpack':
+                import msgpack
+                return msgpack.unpackb(payload, raw = False, strict_map_key = False)
+
+            case 'pickle':
+                return pickle.loads(payload)
+
+            case 'arrow':
+                import pyarrow as pa
+                return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+            case 'parquet':
+                import pyarrow.parquet as pq
+                return pq.read_table(io.BytesIO(payload)).to_pandas()
+
+    def _compress(self, payload: bytes) -> tuple[str | None, bytes]:
+        if self.compression is None or len(payload) < self.min_size or self.serializer in ('arrow', 'parquet'):
+            return None, payload
+        match self.compression:
+            case 'zlib':
+                return 'zlib', zlib.compress(payload, 6 if self.level is None else self.level)
+            case 'zstd':
+                import zstandard
+                return 'zstd', zstandard.ZstdCompressor(level = 3 if self.level is None else self.level).compress(payload)
+            case 'lz4':
+                import lz4.frame
+                return 'lz4', lz4.frame.compress(payload, compression_level = self.level or 0)
+
+    @staticmethod
+    def _decompress(compression: str | None, payload: bytes) -> bytes:
+        match compression:
+            case None:
+                return payload
+            case 'zlib':
+                return zlib.decompress(payload)
+            case 'zstd':
+                import zstandard
+                return zstandard.ZstdDecompressor().decompress(payload)
+            case 'lz4':
+                import lz4.frame
+                return lz4.frame.decompress(payload)
+
+    def encode(self, value) -> bytes:
+        compression, payload = self._compress(self._serialize(value))
+        return self.magic + bytes((self.serializers.index(self.serializer), self.compressions.index(compression))) + payload
+
+    def decode(self, blob: bytes):
+        '''
+        Value of a blob written by any codec, pickle blobs need `allow_pickle`
+        '''
+        return Codec.loads(blob, self.allow_pickle)
+
+    @classmethod
+    def loads(cls, blob: bytes, allow_pickle: bool = False):
+        if not cls.is_encoded(blob) or blob[2] >= len(cls.serializers) or blob[3] >= len(cls.compressions):
+            raise ValueError('Not a Codec encoded blob')
+        serializer, compression = cls.serializers[blob[2]], cls.compressions[blob[3]]
+        if serializer == 'pickle' and not allow_pickle:
+            raise ValueError('Refuse to unpickle a blob without allow_pickle')
+        return cls._deserialize(serializer, cls._decompress(compression, blob[4:]))
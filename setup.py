@@ -23,5 +23,15 @@ setup(
         'pillow>=10.3.0',
         'cryptography>=41.0.7',
         'openpyxl>=3.1.3',
+        # func.database imports it at module level, redis.asyncio needs 4.2
+        'redis>=4.2.0',
     ],
+    extras_require = {
+        # export_table / import_table / read_export, put_frame and the default Redis_Cache
+        'arrow': ['pyarrow>=10.0.1'],
+        # msgpack serializer, zstd / lz4 compressions of Codec
+        'redis': ['msgpack>=1.0.5', 'zstandard>=0.21.0', 'lz4>=4.3.2'],
+        # func.async_database, default sqlite driver
+        'async': ['SQLAlchemy[asyncio]>=2.0.23', 'aiosqlite>=0.19.0'],
+    },
 )
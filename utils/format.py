@@ -1,4 +1,6 @@
-import time
+import re, time
+import numpy as np
+import pandas as pd
 
 from datetime import datetime
 
@@ -46,6 +48,235 @@ class Formater:
 
         return time.strftime(keyword, time.gmtime(target))
 
+    # `time.strptime` default layout, tried when strings aren't ISO-8601
+    strptime_format = '%a %b %d %H:%M:%S %Y'
+    # strftime directives `format_dates` builds itself -> output width
+    batch_directives = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2, '%y': 2, '%j': 3, '%a': 3, '%%': 1}
+    # epoch seconds of 0001-01-01 and 10000-01-01
+    epoch_range = (-62135596800, 253402300800)
+    week_codes = np.array([[ord(c) for c in name] for name in ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')], dtype = np.uint32)
+
+    @staticmethod
+    def _local_to_utc(values: pd.Series) -> pd.Series:
+        '''
+        Naive datetimes are local time (as `datetime.timestamp` / `time.mktime` read them), 
+        tz-aware ones are converted; the result is naive UTC
+        '''
+        if values.dt.tz is None:
+            if time.timezone == 0 and not time.daylight:
+                return values
+            from dateutil.tz import tzlocal
+            values = values.dt.tz_localize(tzlocal(), ambiguous = 'NaT', nonexistent = 'shift_forward')
+        return values.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    @staticmethod
+    def _parse_iso_fixed(values: pd.Series) -> pd.Series | None:
+        '''
+        Parse same-length `YYYY-MM-DD`, `YYYY-MM-DD[T ]HH:MM:SS` strings, optionally ending 
+        in `Z` / `+HH:MM`, by digit arithmetic on their characters; None when they aren't all that shape
+        '''
+        if not len(values) or not pd.api.types.is_string_dtype(values) or values.isna().any():
+            return None
+        lengths = values.str.len()
+        width = int(lengths.iloc[0])
+        if width not in (10, 19, 20, 25) or (lengths != width).any():
+            return None
+
+        try:
+            chars = np.asarray(values.tolist(), dtype = f'S{width}').view(np.uint8).reshape(len(values), width)
+        except UnicodeEncodeError:
+            return None
+        layout = {4: '-', 7: '-', 10: 'T ', 13: ':', 16: ':', 19: 'Z' if width == 20 else '+-', 22: ':'}
+        for col, allowed in layout.items():
+            if col < width and not np.isin(chars[:, col], [ord(c) for c in allowed]).all():
+                return None
+        # uint8 wraps characters below '0' past 9 as well
+        digits = chars - np.uint8(48)
+        if (digits[:, [col for col in range(width) if col not in layout]] > 9).any():
+            return None
+
+        def number(start: int, stop: int) -> np.ndarray:
+            value = np.zeros(len(digits), dtype = np.int64)
+            for col in range(start, stop):
+                value = value * 10 + digits[:, col]
+            return value
+
+        year, month, day = number(0, 4), number(5, 7), number(8, 10)
+        if ((month < 1) | (month > 12) | (day < 1)).any():
+            return None
+        months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+        stamps = months.astype('datetime64[s]') + (day - 1).astype('timedelta64[D]')
+        # day past the month end
+        if (stamps.astype('datetime64[M]') != months).any():
+            return None
+
+        if width > 10:
+            hour, minute, second = number(11, 13), number(14, 16), number(17, 19)
+            if ((hour > 23) | (minute > 59) | (second > 59)).any():
+                return None
+            stamps = stamps + (hour * 3600 + minute * 60 + second).astype('timedelta64[s]')
+        if width == 25:
+            sign = np.where(chars[:, 19] == ord('-'), -1, 1)
+            stamps = stamps - (sign * (number(20, 22) * 60 + number(23, 25))).astype('timedelta64[m]')
+
+        stamps = pd.Series(stamps.astype('datetime64[ns]'))
+        return stamps.dt.tz_localize('UTC') if width in (20, 25) else stamps
+
+    @classmethod
+    def _parse_strings(cls, values: pd.Series, format: str | None) -> pd.Series:
+        '''
+        ISO-8601 first, values it can't read retry with the `time.strptime` layout
+        '''
+        if format is not None:
+            return pd.to_datetime(values, format = format, errors = 'coerce')
+        if (parsed := cls._parse_iso_fixed(values)) is not None:
+            return parsed
+        try:
+            parsed = pd.to_datetime(values, format = 'ISO8601', errors = 'coerce')
+        except ValueError:
+            # mixed utc offsets can only share a utc column
+            parsed = pd.to_datetime(values, format = 'ISO8601', errors = 'coerce', utc = True)
+
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            fallback = pd.to_datetime(values[retry], format = cls.strptime_format, errors = 'coerce')
+            if parsed.dt.tz is not None:
+                fallback = cls._local_to_utc(fallback).dt.tz_localize('UTC').dt.tz_convert(parsed.dt.tz)
+            parsed = parsed.where(~retry, fallback)
+        return parsed
+
+    @classmethod
+    def _offsets(cls, time_zone, size: int) -> np.ndarray | np.timedelta64:
+        '''
+        Timezone offset of one `datetime_timezone` key, or of each key in a sequence
+        '''
+        if isinstance(time_zone, str):
+            return np.timedelta64(cls.datetime_timezone.get(time_zone, 0) * 3600, 's')
+        hours = pd.Series(np.asarray(time_zone)).map(cls.datetime_timezone).fillna(0).to_numpy()
+        if len(hours) != size:
+            raise ValueError(f'Got {len(hours)} time zones for {size} targets')
+        return (hours * 3600).astype('timedelta64[s]')
+
+    @classmethod
+    def parse_dates(cls,
+        targets: list | np.ndarray | pd.Series,
+        time_zone: str | list = 'utf',
+        format: str | None = None) -> np.ndarray:
+        '''
+        Parse A Batch Of Epoch Floats, Datetimes Or Strings Into datetime64[s].
+
+        ------
+        Vectorized `format_date` without the final strftime: values are read as UTC epochs
+        the same way, then shifted by `time_zone` (one key or one per target) in bulk.
+
+        Strings go through an ISO-8601 fast path, falling back to `format` 
+        (default the `time.strptime` layout); unparsable values become NaT.
+        Seconds resolution keeps epochs past the datetime64[ns] range (1678 - 2262),
+        epochs outside years 1 - 9999 become NaT.
+
+        >>> Formater.parse_dates([0, 1.7e9, 1e10], 'china')
+            array(['1970-01-01T08:00:00', '2023-11-15T06:13:20', '2286-11-21T01:46:40'], dtype='datetime64[s]')
+        '''
+        values = targets if isinstance(targets, pd.Series) else pd.Series(np.asarray(targets) if not isinstance(targets, list) else targets)
+        values = values.reset_index(drop = True)
+
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            seconds = values.to_numpy('float64', na_value = np.nan)
+            # floored like `time.gmtime`, a day of slack for the time zone shift checked below
+            valid = (seconds >= cls.epoch_range[0] - 86400) & (seconds < cls.epoch_range[1] + 86400)
+            utc = np.floor(np.where(valid, seconds, 0)).astype('int64').astype('datetime64[s]')
+            utc[~valid] = np.datetime64('NaT')
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            utc = cls._local_to_utc(values).to_numpy('datetime64[s]')
+        else:
+            utc = cls._local_to_utc(cls._parse_strings(values, format)).to_numpy('datetime64[s]')
+
+        stamps = utc + cls._offsets(time_zone, len(utc))
+        # only years `time.strftime` handles
+        stamps[(stamps < np.datetime64(cls.epoch_range[0], 's')) | (stamps >= np.datetime64(cls.epoch_range[1], 's'))] = \
+            np.datetime64('NaT')
+        return stamps
+
+    @classmethod
+    def _strftime(cls, stamps: np.ndarray, keyword: str) -> np.ndarray | None:
+        '''
+        Build formatted strings as a character matrix from datetime64 fields, 
+        None when `keyword` uses directives outside `batch_directives`
+        '''
+        tokens = re.findall(r'%.|[^%]+', keyword)
+        if any(token.startswith('%') and token not in cls.batch_directives for token in tokens):
+            return None
+
+        days = stamps.astype('datetime64[D]')
+        months = stamps.astype('datetime64[M]')
+        years = stamps.astype('datetime64[Y]')
+        seconds = (stamps - days).astype('timedelta64[s]').astype(np.int64)
+        fields = {
+            '%Y': lambda: years.astype(np.int64) + 1970,
+            '%y': lambda: (years.astype(np.int64) + 1970) % 100,
+            '%m': lambda: months.astype(np.int64) % 12 + 1,
+            '%d': lambda: (days - months).astype(np.int64) + 1,
+            '%j': lambda: (days - years).astype(np.int64) + 1,
+            '%H': lambda: seconds // 3600,
+            '%M': lambda: seconds // 60 % 60,
+            '%S': lambda: seconds % 60,
+        }
+
+        width = sum(cls.batch_directives.get(token, len(token)) for token in tokens)
+        # filled one character position per row, transposed into strings at the end; 
+        # ascii layouts use one byte per character, a quarter of the memory to move
+        ascii = keyword.isascii()
+        chars, col = np.empty((max(width, 1), len(stamps)), dtype = np.uint8 if ascii else np.uint32), 0
+        for token in tokens:
+            size = cls.batch_directives.get(token, len(token))
+            if token == '%a':
+                chars[col: col + size] = cls.week_codes[(days.astype(np.int64) + 3) % 7].T
+            elif token in fields:
+                value = fields[token]()
+                for i in range(size):
+                    chars[col + size - 1 - i] = value // 10 ** i % 10 + 48
+            else:
+                chars[col: col + size] = np.array([ord(c) for c in (token if token != '%%' else '%')])[:, None]
+            col += size
+        if not width:
+            return np.full(len(stamps), '')
+        strings = np.ascontiguousarray(chars.T).view(f'{"S" if ascii else "<U"}{width}').ravel()
+        return strings.astype(f'<U{width}') if ascii else strings
+
+    @classmethod
+    def format_dates(cls,
+        targets: list | np.ndarray | pd.Series,
+        keyword: str = 'all',
+        time_zone: str | list = 'utf',
+        format: str | None = None) -> np.ndarray | pd.Series:
+        '''
+        Format A Batch Of Dates To Strings.
+
+        ------
+        Vectorized `format_date` over lists, arrays or Series of epoch floats, datetimes
+        or strings (see `parse_dates`); layouts made of `batch_directives` are built 
+        straight from datetime64 fields, other ones go through pandas strftime.
+
+        A Series returns a Series on the same index, NaT formats as 'NaT'.
+
+        >>> Formater.format_dates(np.array([0., 86400.]), 'day')
+            array(['1970-01-01', '1970-01-02'], dtype='<U10')
+        '''
+        stamps = cls.parse_dates(targets, time_zone, format)
+        missing = np.isnat(stamps)
+        keyword = cls.datetime_format_dict.get(keyword, keyword)
+
+        result = cls._strftime(stamps, keyword)
+        if result is None:
+            result = pd.Series(stamps).dt.strftime(keyword).to_numpy(dtype = str)
+
+        if missing.any():
+            result = result.astype(f'<U{max(result.dtype.itemsize // 4, 3)}')
+            result[missing] = 'NaT'
+        if isinstance(targets, pd.Series):
+            return pd.Series(result, index = targets.index, name = targets.name)
+        return result
+
 
 if __name__ == '__main__':
     print(Formater.format_date(keyword = '%Z'))
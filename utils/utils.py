@@ -1,10 +1,15 @@
-import time, json, base64
+import io, os, time, json, zlib, base64, zipfile, threading
 
-from functools import wraps
-from typing import Literal
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, wraps
+from itertools import islice, repeat
+from typing import Iterable, Iterator, Literal
 
 import qrcode
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, PdfParser, TiffImagePlugin
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
 from Crypto.Random import get_random_bytes
@@ -30,6 +35,116 @@ def piece_response(code: int, info: str) -> dict:
     return json.dumps({"code": code, info_key: info}, ensure_ascii=False)
 
 
+# default QRCode version, the fit grows it for longer data
+QR_VERSION = 4
+
+
+_thread_fonts = threading.local()
+
+
+def _load_font(**font_style) -> ImageFont.FreeTypeFont:
+    """
+    Load a TrueType font once per thread, a FreeType face can't be used by two threads at once
+    """
+    fonts = _thread_fonts.__dict__.setdefault("fonts", {})
+    key = tuple(sorted(font_style.items()))
+    if key not in fonts:
+        fonts[key] = ImageFont.truetype(**font_style)
+    return fonts[key]
+
+
+def _qr_image(qr_info: str) -> Image.Image:
+    """
+    Render the black & white QrCode of `qr_info`, a new `QRCode` per call keeps it thread safe
+    """
+    qr = qrcode.QRCode(version=QR_VERSION)
+    qr.add_data(qr_info)
+    qr.make(fit=True)
+
+    # modules scaled up to boxes, same pixels as `qr.make_image` without drawing box by box
+    blank = ~np.asarray(qr.get_matrix(), dtype=bool)
+    pixels = blank.repeat(qr.box_size, axis=0).repeat(qr.box_size, axis=1)
+    return Image.fromarray(pixels)
+
+
+@lru_cache(maxsize=1024)
+def _label_layout(
+    font_key: tuple,
+    first_word: str,
+    qr_size: tuple,
+    lines: tuple,
+    info_gap: int,
+    info_border: int,
+    text_position: str,
+    text_direction: str,
+) -> tuple:
+    """
+    Image size, QrCode location and text locations of a label,
+    `lines` -> (length, is numeric) of each text line
+    """
+    assert text_direction in (
+        "h",
+        "v",
+    ), f"ValueError, Get Wrong Direction {text_direction}"
+    _, _, word_width, word_height = _load_font(**dict(font_key)).getbbox(first_word)
+
+    max_line_length = max(length for length, _ in lines)
+    if text_direction == "h":
+        text_width = max_line_length * word_width
+        text_height = len(lines) * word_height + (len(lines) - 1) * info_gap
+    else:
+        text_width = len(lines) * word_width + (len(lines) - 1) * info_gap
+        text_height = max_line_length * word_height
+
+    gene_width, gene_height = 0, 0
+    match text_position:
+        case "left" | "right":
+            gene_width = qr_size[0] + text_width + info_border
+            gene_height = max(qr_size[1], text_height)
+        case "top" | "bottom":
+            gene_width = max(qr_size[0], text_width)
+            gene_height = qr_size[1] + text_height + info_border
+
+    # paste qrcode image to the new generated image to suitable position
+    match text_position:
+        case "left":
+            qr_location = (text_width, 0)
+        case "right":
+            qr_location = (0, 0)
+        case "top":
+            qr_location = ((gene_width - qr_size[0]) // 2, text_height)
+        case "bottom":
+            qr_location = ((gene_width - qr_size[0]) // 2, 0)
+
+    text_locations = []
+    for index, (length, numeric) in enumerate(lines):
+        need_cut = numeric and text_position not in ("left", "right")
+        word_count = length / 2 if need_cut else length
+        match text_position:
+            case "left":
+                text_location = (
+                    (index + 1) * info_gap,
+                    (gene_height - word_height * word_count) / 2,
+                )
+            case "right":
+                text_location = (
+                    qr_size[0] + index * info_gap,
+                    (gene_height - word_height * word_count) / 2,
+                )
+            case "top":
+                text_location = (
+                    (gene_width - word_width * word_count) / 2,
+                    (index + 1) * info_gap,
+                )
+            case "bottom":
+                text_location = (
+                    (gene_width - word_width * word_count) / 2,
+                    qr_size[1] + index * info_gap,
+                )
+        text_locations.append(text_location)
+    return (gene_width, gene_height), qr_location, tuple(text_locations)
+
+
 def generate_qrcode(
     qr_info: str,
     save_path: str = None,
@@ -42,6 +157,7 @@ def generate_qrcode(
         "font": "msyh.ttc",
         "size": 16,
     },
+    show: bool = True,
 ) -> bool | Image.Image:
     """
     Generate QrCode With Text Based On PIL & [qrcode](https://pypi.org/project/qrcode/)
@@ -60,99 +176,33 @@ def generate_qrcode(
 
     `font_style` -> font style dict
 
+    `show` -> open the image in the system viewer
+
     Other Info Please Reference [PIL Doc](https://pillow.readthedocs.io/en/stable/).
     """
-
-    def calc_text_size(word_width, word_height) -> tuple:
-        assert text_direction in (
-            "h",
-            "v",
-        ), f"ValueError, Get Wrong Direction {text_direction}"
-        max_line_length = max(len(line) for line in add_info)
-
-        if text_direction == "h":
-            text_width = max_line_length * word_width
-            text_height = len(add_info) * word_height + (len(add_info) - 1) * info_gap
-        else:
-            text_width = len(add_info) * word_width + (len(add_info) - 1) * info_gap
-            text_height = max_line_length * word_height
-        return text_width, text_height
-
-    def calc_gene_size(text_size, qr_size) -> tuple:
-        gene_width, gene_height = 0, 0
-        match text_position:
-            case "left" | "right":
-                gene_width = qr_size[0] + text_size[0] + info_border
-                gene_height = max(qr_size[1], text_size[1])
-            case "top" | "bottom":
-                gene_width = max(qr_size[0], text_size[0])
-                gene_height = qr_size[1] + text_size[1] + info_border
-        return gene_width, gene_height
-
-    def calc_text_loc(word_count: int) -> tuple:
-        match text_position:
-            case "left":
-                text_location = (
-                    (index + 1) * info_gap,
-                    (gene_height - word_height * word_count) / 2,
-                )
-            case "right":
-                text_location = (
-                    qr_image.size[0] + index * info_gap,
-                    (gene_height - word_height * word_count) / 2,
-                )
-            case "top":
-                text_location = (
-                    (gene_width - word_width * word_count) / 2,
-                    (index + 1) * info_gap,
-                )
-            case "bottom":
-                text_location = (
-                    (gene_width - word_width * word_count) / 2,
-                    qr_image.size[1] + index * info_gap,
-                )
-        return text_location
-
     # create basic qrcode
-    qr = qrcode.QRCode(
-        version=4,
-    )
-    qr.add_data(
-        qr_info,
-    )
-    qr.make(fit=True)
-    qr_image = qr.make_image(fill_color="black", back_color="white")
+    qr_image = _qr_image(qr_info)
 
     if add_info:
-        # initialize configuration
-        font = ImageFont.truetype(**font_style)
-
-        # create generated image
-        _, _, word_width, word_height = font.getbbox(add_info[0][0])
-        text_size = calc_text_size(word_width, word_height)
-        gene_width, gene_height = calc_gene_size(text_size, qr_image.size)
-        gene_image = Image.new("RGB", (gene_width, gene_height), "white")
-
-        # paste qrcode image to the new generated image to suitable position
-        match text_position:
-            case "left":
-                gene_image.paste(qr_image, (text_size[0], 0))
-            case "right":
-                gene_image.paste(qr_image, (0, 0))
-            case "top":
-                gene_image.paste(
-                    qr_image, ((gene_width - qr_image.size[0]) // 2, text_size[1])
-                )
-            case "bottom":
-                gene_image.paste(qr_image, ((gene_width - qr_image.size[0]) // 2, 0))
+        # fonts and layouts are cached, labels sharing a shape only draw
+        font = _load_font(**font_style)
+        gene_size, qr_location, text_locations = _label_layout(
+            tuple(sorted(font_style.items())),
+            add_info[0][0],
+            qr_image.size,
+            tuple((len(tiny), tiny.isnumeric()) for tiny in add_info),
+            info_gap,
+            info_border,
+            text_position,
+            text_direction,
+        )
+        gene_image = Image.new("RGB", gene_size, "white")
+        gene_image.paste(qr_image, qr_location)
 
         # draw info text to the image
         drawer = ImageDraw.Draw(gene_image)
-        for index, tiny in enumerate(add_info, 0):
-            need_cut = tiny.isnumeric() and text_position not in ("left", "right")
-            word_count = len(tiny) / 2 if need_cut else len(tiny)
+        for tiny, text_location in zip(add_info, text_locations):
             format_tiny = tiny if text_direction == "h" else "\n".join(tiny)
-            text_location = calc_text_loc(word_count)
             drawer.text(
                 text_location, format_tiny, font=font, fill="black", align="center"
             )
@@ -161,7 +211,8 @@ def generate_qrcode(
         gene_image = Image.new("RGB", qr_image.size, "white")
         gene_image.paste(qr_image, (0, 0))
 
-    gene_image.show("temp")
+    if show:
+        gene_image.show("temp")
     if save_path:
         gene_image.save(save_path)
         return True
@@ -169,6 +220,289 @@ def generate_qrcode(
         return gene_image
 
 
+def _render_qrcodes(chunk: list, layout: dict, image_format: str) -> list:
+    """
+    Encode a chunk of labels, return (file name, image bytes) pairs
+    """
+    rendered = []
+    for name, qr_info, *add_info in chunk:
+        image = generate_qrcode(
+            qr_info, add_info=add_info[0] if add_info else None, show=False, **layout
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, image_format)
+        rendered.append((f"{name}.{image_format.lower()}", buffer.getvalue()))
+    return rendered
+
+
+def generate_qrcodes(
+    items: Iterable[tuple],
+    out_dir: str,
+    workers: int | None = None,
+    chunksize: int = 64,
+    image_format: str = "png",
+    info_gap: int = 25,
+    info_border: int = 5,
+    text_position: Literal["left", "right", "top", "bottom"] = "right",
+    text_direction: Literal["h", "v"] = "h",
+    font_style: dict = {
+        "font": "msyh.ttc",
+        "size": 16,
+    },
+) -> int:
+    """
+    Generate QrCodes In Batch Across A Process Pool, Return The Written Count
+
+    `items` -> `(file name, qr_info)` or `(file name, qr_info, add_info)` tuples, read lazily
+
+    `out_dir` -> the directory images are written into, or a `.zip` archive they're streamed into
+
+    `workers` -> render processes, default `os.cpu_count()`, 1 renders in this process
+
+    `chunksize` -> labels per task, at most 2 tasks per worker are in flight
+
+    Layout arguments are the same as `generate_qrcode`, no viewer is opened.
+
+    >>> generate_qrcodes(
+    ...     ((f"asset-{i}", f"http://oa.nsyy.com.cn:6060/?id={i}", ["地点码", str(i)]) for i in range(50000)),
+    ...     "./labels.zip", text_position="left")
+    50000
+    """
+    layout = {
+        "info_gap": info_gap,
+        "info_border": info_border,
+        "text_position": text_position,
+        "text_direction": text_direction,
+        "font_style": font_style,
+    }
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunksize)), [])
+
+    if out_dir.endswith(".zip"):
+        os.makedirs(os.path.dirname(os.path.abspath(out_dir)), exist_ok=True)
+        # images are compressed already
+        archive = zipfile.ZipFile(out_dir, "w", zipfile.ZIP_STORED)
+        write = archive.writestr
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+        archive = None
+
+        def write(name: str, data: bytes):
+            with open(os.path.join(out_dir, name), "wb") as file:
+                file.write(data)
+
+    count = 0
+    workers = workers or os.cpu_count()
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                for name, data in _render_qrcodes(chunk, layout, image_format):
+                    write(name, data)
+                    count += 1
+            return count
+
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_render_qrcodes, chunk, layout, image_format))
+                while pending and (pending[0].done() or len(pending) >= 2 * workers):
+                    for name, data in pending.popleft().result():
+                        write(name, data)
+                        count += 1
+            while pending:
+                for name, data in pending.popleft().result():
+                    write(name, data)
+                    count += 1
+        return count
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+# paper sizes in millimetres, (width, height)
+PAGE_SIZES = {
+    "A3": (297, 420),
+    "A4": (210, 297),
+    "A5": (148, 210),
+    "Letter": (215.9, 279.4),
+}
+
+
+def _iter_label_pages(
+    items: Iterable[tuple],
+    page_size: tuple,
+    margin: int,
+    spacing: int,
+    label_size: tuple | None,
+    layout: dict,
+) -> Iterator[Image.Image]:
+    """
+    Render labels one by one onto black & white pages, yield every filled page
+    """
+    page, index, columns = None, 0, None
+    for qr_info, *add_info in items:
+        label = generate_qrcode(
+            qr_info, add_info=add_info[0] if add_info else None, show=False, **layout
+        )
+        if columns is None:
+            # cell size and grid come from the first label
+            cell_width, cell_height = label_size or label.size
+            columns = (page_size[0] - 2 * margin + spacing) // (cell_width + spacing)
+            rows = (page_size[1] - 2 * margin + spacing) // (cell_height + spacing)
+            if columns < 1 or rows < 1:
+                raise ValueError(
+                    f"Label {cell_width}x{cell_height} doesn't fit the page {page_size[0]}x{page_size[1]}"
+                )
+        if label.width > cell_width or label.height > cell_height:
+            label.thumbnail((cell_width, cell_height), Image.Resampling.LANCZOS)
+
+        if page is None:
+            page, index = Image.new("1", page_size, 1), 0
+        row, column = divmod(index, columns)
+        page.paste(
+            label.convert("1", dither=Image.Dither.NONE),
+            (
+                margin + column * (cell_width + spacing) + (cell_width - label.width) // 2,
+                margin + row * (cell_height + spacing) + (cell_height - label.height) // 2,
+            ),
+        )
+        index += 1
+        if index == columns * rows:
+            yield page
+            page = None
+    if page is not None:
+        yield page
+
+
+def _write_pdf_pages(pages: Iterator[Image.Image], save_path: str, dpi: int) -> int:
+    """
+    Write each page as a Flate compressed 1-bit image as it arrives,
+    the page tree and catalog go last, so only one page is held at a time
+    """
+    pdf = PdfParser.PdfParser(filename=save_path, mode="w+b")
+    pdf.start_writing()
+    pdf.write_header()
+    pdf.write_comment("created by Rain-Units label sheets")
+    pages_ref, page_refs = pdf.next_object_id(0), []
+    try:
+        for page in pages:
+            # packed 1-bit rows, white is 1 both in PIL and in DeviceGray
+            image_ref = pdf.write_obj(
+                None,
+                stream=zlib.compress(page.tobytes(), 6),
+                Type=PdfParser.PdfName("XObject"),
+                Subtype=PdfParser.PdfName("Image"),
+                Width=page.width,
+                Height=page.height,
+                ColorSpace=PdfParser.PdfName("DeviceGray"),
+                BitsPerComponent=1,
+                Filter=PdfParser.PdfName("FlateDecode"),
+            )
+            width, height = page.width * 72.0 / dpi, page.height * 72.0 / dpi
+            contents_ref = pdf.write_obj(
+                None, stream=b"q %f 0 0 %f 0 0 cm /image Do Q\n" % (width, height)
+            )
+            page_refs.append(
+                pdf.write_obj(
+                    None,
+                    Type=PdfParser.PdfName("Page"),
+                    Parent=pages_ref,
+                    Resources=PdfParser.PdfDict(
+                        ProcSet=[PdfParser.PdfName("PDF"), PdfParser.PdfName("ImageB")],
+                        XObject=PdfParser.PdfDict(image=image_ref),
+                    ),
+                    MediaBox=[0, 0, width, height],
+                    Contents=contents_ref,
+                )
+            )
+        pdf.write_obj(
+            pages_ref,
+            Type=PdfParser.PdfName("Pages"),
+            Count=len(page_refs),
+            Kids=page_refs,
+        )
+        pdf.root_ref = pdf.write_obj(
+            None, Type=PdfParser.PdfName("Catalog"), Pages=pages_ref
+        )
+        pdf.write_xref_and_trailer()
+    finally:
+        pdf.close()
+    return len(page_refs)
+
+
+def compose_label_sheets(
+    items: Iterable[tuple],
+    save_path: str,
+    page_size: str | tuple = "A4",
+    dpi: int = 300,
+    margin: float = 10,
+    spacing: float = 2,
+    label_size: tuple | None = None,
+    info_gap: int = 25,
+    info_border: int = 5,
+    text_position: Literal["left", "right", "top", "bottom"] = "right",
+    text_direction: Literal["h", "v"] = "h",
+    font_style: dict = {
+        "font": "msyh.ttc",
+        "size": 16,
+    },
+) -> int:
+    """
+    Tile QrCode Labels Into A Multi-Page PDF/TIFF, Return The Page Count
+
+    `items` -> `(qr_info,)` or `(qr_info, add_info)` tuples, read lazily
+
+    `save_path` -> `.pdf` or `.tif`/`.tiff` file, pages are written as they fill up,
+    so memory stays at one page for any number of labels
+
+    `page_size` -> key of `PAGE_SIZES` or (width, height) in millimetres
+
+    `dpi` -> page resolution, labels are placed at their pixel size
+
+    `margin`, `spacing` -> page margin and gap between labels in millimetres
+
+    `label_size` -> grid cell size in pixels, default the first label's size;
+    larger labels are scaled down into it, smaller ones are centered
+
+    Layout arguments are the same as `generate_qrcode`. Pages are black & white.
+
+    >>> compose_label_sheets(
+    ...     ((f"http://oa.nsyy.com.cn:6060/?id={i}", ["地点码", str(i)]) for i in range(50000)),
+    ...     "./labels.pdf", text_position="left")
+    """
+    extension = os.path.splitext(save_path)[1].lower()
+    if extension not in (".pdf", ".tif", ".tiff"):
+        raise ValueError(f"Unsupported sheet format {extension}, expect .pdf / .tif / .tiff")
+    millimetre = dpi / 25.4
+    if isinstance(page_size, str):
+        page_size = PAGE_SIZES[page_size]
+    pages = _iter_label_pages(
+        items,
+        (round(page_size[0] * millimetre), round(page_size[1] * millimetre)),
+        round(margin * millimetre),
+        round(spacing * millimetre),
+        label_size,
+        {
+            "info_gap": info_gap,
+            "info_border": info_border,
+            "text_position": text_position,
+            "text_direction": text_direction,
+            "font_style": font_style,
+        },
+    )
+
+    if extension == ".pdf":
+        return _write_pdf_pages(pages, save_path, dpi)
+
+    count = 0
+    with TiffImagePlugin.AppendingTiffWriter(save_path, new=True) as tiff:
+        for page in pages:
+            page.save(tiff, "TIFF", compression="group4", dpi=(dpi, dpi))
+            tiff.newFrame()
+            count += 1
+    return count
+
+
 def aes_encrypt(plain_text: str, key: str):
     """
     Use Assigned AES Key Encrypt Text
@@ -196,6 +530,187 @@ def aes_decrypt(encrypted_text: str, key: str):
     return decrypted_text.decode("utf-8")
 
 
+# encrypted stream header: magic, mode id, then the mode's iv / nonce
+AES_MAGIC = b"RAES"
+AES_MODES = ("cbc", "ctr", "gcm")
+AES_NONCE_SIZES = {"cbc": AES.block_size, "ctr": 8, "gcm": 12}
+AES_TAG_SIZE = 16
+
+
+def _open_binary(target, mode: str):
+    """
+    Open a path, or pass an already opened binary file through unclosed
+    """
+    if isinstance(target, (str, bytes, os.PathLike)):
+        return open(target, mode)
+    return nullcontext(target)
+
+
+def _new_cipher(key: bytes, mode: str, nonce: bytes):
+    match mode:
+        case "cbc":
+            return AES.new(key, AES.MODE_CBC, iv=nonce)
+        case "ctr":
+            return AES.new(key, AES.MODE_CTR, nonce=nonce)
+        case "gcm":
+            return AES.new(key, AES.MODE_GCM, nonce=nonce)
+
+
+def aes_encrypt_stream(
+    source,
+    target,
+    key: bytes,
+    mode: Literal["cbc", "ctr", "gcm"] = "gcm",
+    chunk_size: int = 1024**2,
+) -> int:
+    """
+    Encrypt A File Or Binary Stream Chunk By Chunk, Return The Written Byte Count
+
+    `source` / `target` -> paths or binary file objects, output is raw bytes without base64
+
+    `key` -> 16 / 24 / 32 bytes AES key
+
+    `mode` -> `gcm` authenticates the header and data (tag appended at the end),
+    `ctr` / `cbc` only encrypt, `cbc` pads the last block
+
+    `chunk_size` -> bytes read per step, a multiple of 16; memory stays at about two chunks
+
+    >>> key = get_random_bytes(32)
+    >>> aes_encrypt_stream("export.csv", "export.csv.aes", key)
+    >>> aes_decrypt_stream("export.csv.aes", "export.csv", key)
+    >>> aes_encrypt_stream("export.csv", "export.csv.aes", key, "ctr")
+    >>> aes_decrypt_stream("export.csv.aes", "export.csv", key, "ctr")
+    """
+    assert mode in AES_MODES, f"ValueError, Get Wrong AES Mode {mode}"
+    assert chunk_size % AES.block_size == 0, f"ValueError, Chunk Size {chunk_size} Isn't Multiple Of 16"
+    nonce = get_random_bytes(AES_NONCE_SIZES[mode])
+    cipher = _new_cipher(key, mode, nonce)
+    header = AES_MAGIC + bytes((AES_MODES.index(mode),)) + nonce
+    if mode == "gcm":
+        cipher.update(header)
+
+    with _open_binary(source, "rb") as reader, _open_binary(target, "wb") as writer:
+        written = writer.write(header)
+        chunk = reader.read(chunk_size)
+        while True:
+            # read one chunk ahead, cbc pads only the last one
+            next_chunk = reader.read(chunk_size) if chunk else b""
+            if not next_chunk and mode == "cbc":
+                chunk = pad(chunk, AES.block_size)
+            if chunk:
+                written += writer.write(cipher.encrypt(chunk))
+            if not next_chunk:
+                break
+            chunk = next_chunk
+        if mode == "gcm":
+            written += writer.write(cipher.digest())
+    return written
+
+
+def aes_decrypt_stream(
+    source,
+    target,
+    key: bytes,
+    mode: Literal["cbc", "ctr", "gcm"] = "gcm",
+    chunk_size: int = 1024**2,
+) -> int:
+    """
+    Decrypt A Stream Written By `aes_encrypt_stream`, Return The Written Byte Count
+
+    `mode` -> the mode the stream must have been written with, a header naming another
+    mode raises `ValueError` before anything is decrypted, so a `gcm` stream can't be
+    downgraded to an unauthenticated mode; `ctr` / `cbc` streams need it passed explicitly
+
+    A wrong key or modified `gcm` data raises `ValueError` after the last chunk, a `target`
+    path is removed then, a file object holds unverified data and should be discarded.
+    """
+    assert mode in AES_MODES, f"ValueError, Get Wrong AES Mode {mode}"
+    assert chunk_size % AES.block_size == 0, f"ValueError, Chunk Size {chunk_size} Isn't Multiple Of 16"
+    with _open_binary(source, "rb") as reader:
+        header = reader.read(len(AES_MAGIC) + 1)
+        if (
+            len(header) <= len(AES_MAGIC)
+            or header[: len(AES_MAGIC)] != AES_MAGIC
+            or header[-1] >= len(AES_MODES)
+        ):
+            raise ValueError("Not an aes_encrypt_stream output")
+        if AES_MODES[header[-1]] != mode:
+            raise ValueError(f"Expect a {mode} stream, the header says {AES_MODES[header[-1]]}")
+        nonce = reader.read(AES_NONCE_SIZES[mode])
+        if len(nonce) != AES_NONCE_SIZES[mode]:
+            raise ValueError("Not an aes_encrypt_stream output")
+        cipher = _new_cipher(key, mode, nonce)
+        if mode == "gcm":
+            cipher.update(header + nonce)
+        # bytes held back from every chunk, the gcm tag or the cbc padded block
+        hold = {"cbc": AES.block_size, "ctr": 0, "gcm": AES_TAG_SIZE}[mode]
+
+        written = 0
+        try:
+            with _open_binary(target, "wb") as writer:
+                buffer = b""
+                while chunk := reader.read(chunk_size):
+                    buffer += chunk
+                    if len(buffer) > hold:
+                        # cbc decrypts whole blocks only
+                        size = len(buffer) - hold
+                        size -= size % AES.block_size if mode == "cbc" else 0
+                        written += writer.write(cipher.decrypt(buffer[:size]))
+                        buffer = buffer[size:]
+                match mode:
+                    case "cbc":
+                        written += writer.write(unpad(cipher.decrypt(buffer), AES.block_size))
+                    case "ctr":
+                        written += writer.write(cipher.decrypt(buffer))
+                    case "gcm":
+                        cipher.verify(buffer)
+        except ValueError:
+            if isinstance(target, (str, bytes, os.PathLike)) and os.path.exists(target):
+                os.remove(target)
+            raise
+    return written
+
+
+def _aes_chunk(texts: list, key: bytes, decrypt: bool) -> list:
+    convert = aes_decrypt if decrypt else aes_encrypt
+    return [convert(text, key) for text in texts]
+
+
+def _aes_many(
+    texts: Iterable[str], key: bytes, decrypt: bool, workers: int | None, chunksize: int
+) -> list:
+    texts = iter(texts)
+    chunks = iter(lambda: list(islice(texts, chunksize)), [])
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return [text for chunk in chunks for text in _aes_chunk(chunk, key, decrypt)]
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(_aes_chunk, chunks, repeat(key), repeat(decrypt))
+        return [text for chunk in results for text in chunk]
+
+
+def aes_encrypt_many(
+    texts: Iterable[str], key: bytes, workers: int | None = None, chunksize: int = 2048
+) -> list:
+    """
+    `aes_encrypt` Each Text Across A Process Pool, Results In Input Order
+
+    `workers` -> processes, default `os.cpu_count()`, 1 runs in this process
+
+    `chunksize` -> texts per task, short texts need large chunks to outweigh the pickling
+    """
+    return _aes_many(texts, key, False, workers, chunksize)
+
+
+def aes_decrypt_many(
+    texts: Iterable[str], key: bytes, workers: int | None = None, chunksize: int = 2048
+) -> list:
+    """
+    `aes_decrypt` Each Text Across A Process Pool, Results In Input Order
+    """
+    return _aes_many(texts, key, True, workers, chunksize)
+
+
 class Dot_Dict(dict):
     """
     Create A Packaged Dict Object That Allow `dot .`